@@ -1,7 +1,24 @@
-from abc import ABC, abstractmethod
+from collections import defaultdict
+import bisect
 import datetime
+import functools
+import argparse
+import contextlib
 import os
+import sqlite3
+import sys
 import json
+from typing import ClassVar
+
+try:
+    import orjson
+except ImportError:  # orjson is optional, fall back to the standard json module
+    orjson = None
+
+try:
+    import ijson
+except ImportError:  # ijson is optional, old array files are then parsed at once
+    ijson = None
 
 
 # custom exception classes
@@ -34,6 +51,16 @@ class DuplicateProductIDError(InventoryError):
         super().__init__(self.message)
 
 
+# for handling lookups of product IDs that are not in the inventory
+class ProductNotFoundError(InventoryError):
+    """Exception raised when no product with the given ID exists in the inventory"""
+
+    def __init__(self, product_id):
+        self.product_id = product_id
+        self.message = f"No product with ID {product_id} found."
+        super().__init__(self.message)
+
+
 # for handling invalid product data
 class InvalidProductDataError(InventoryError):
     """Exception raised when trying to load invalid product data from file"""
@@ -47,58 +74,202 @@ class InvalidProductDataError(InventoryError):
 # File path for storing the inventory data
 INVENTORY_FILE = "inventory.json"
 
+# Inventory files with these extensions are stored as SQLite databases
+SQLITE_EXTENSIONS = (".db", ".sqlite", ".sqlite3")
+
+# Format of the dates entered by the user and stored in the inventory file
+DATE_FORMAT = "%d/%m/%Y"
+
+
+# Parse errors raised while reading an old array file with ijson
+_IJSON_ERRORS = (ijson.JSONError,) if ijson is not None else ()
+
+
+# Function to encode data as compact JSON bytes
+def _dumps(data):
+    """Encode data as JSON bytes, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+# Function to decode JSON bytes
+def _loads(data):
+    """Decode JSON bytes, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+# Function to convert a product to a JSON-serializable dictionary
+def _product_to_dict(product):
+    """Build the record stored in the inventory file for a product"""
+    # Common product data
+    product_data = {
+        "product_id": product._product_id,
+        "name": product._name,
+        "price": product._price,
+        "quantity_in_stock": product._quantity_in_stock,
+        "type": product._type_name,
+    }
+
+    # Add specific attributes based on the exact product type
+    product_data.update(_EXTRA_FIELD_GETTERS[type(product)](product))
+    return product_data
 
-# Function to save the inventory data to a file
-def save_inventory(inventory):
-    """Save the inventory data to a file"""
-    try:
-        # Create a list to store serializable product data
-        products_data = []
-
-        # Check if inventory is empty
-        if not inventory._products:
-            print("⚠️ Inventory is empty! Nothing to save.")
-            # Still save an empty list to the file
-            with open(INVENTORY_FILE, "w") as file:
-                json.dump(products_data, file, indent=4)
-            print(f"✅ Empty inventory saved to {INVENTORY_FILE}")
-            return True
 
-        # If we have products, serialize them
-        for product in inventory._products:
-            # Common product data
-            product_data = {
-                "product_id": product._product_id,
-                "name": product._name,
-                "price": product._price,
-                "quantity_in_stock": product._quantity_in_stock,
-                "type": product.__class__.__name__,
-            }
-
-            # Add specific attributes based on product type
-            if isinstance(product, Electronics):
-                product_data["warranty_years"] = product.warranty_years
-                product_data["brand"] = product.brand
-            elif isinstance(product, Grocery):
-                product_data["expiry_date"] = product.expiry_date_str
-            elif isinstance(product, Clothing):
-                product_data["size"] = product.size
-                product_data["material"] = product.material
-
-            products_data.append(product_data)
-
-        # Write to file
-        with open(INVENTORY_FILE, "w") as file:
-            json.dump(products_data, file, indent=4)
-
-        print(
-            f"✅ Inventory with {len(products_data)} products saved to {INVENTORY_FILE} successfully!"
+# Fields common to every product, in constructor order
+_COMMON_FIELDS = ("product_id", "name", "price", "quantity_in_stock")
+
+
+# Function to rebuild a product from a dictionary read from the file
+def _product_from_dict(product_data):
+    """Rebuild a product from its record, dispatching on the "type" field"""
+    # Check for required fields
+    for field in _COMMON_FIELDS + ("type",):
+        if field not in product_data:
+            raise InvalidProductDataError(f"Missing required field: {field}")
+
+    product_type = product_data["type"]
+    product_class = PRODUCT_REGISTRY.get(product_type)
+    if product_class is None:
+        raise InvalidProductDataError(f"Unknown product type: {product_type}")
+
+    # Check for type-specific fields
+    for field in product_class._extra_fields:
+        if field not in product_data:
+            raise InvalidProductDataError(f"Missing {product_type}-specific fields")
+
+    fields = _COMMON_FIELDS + product_class._extra_fields
+    return product_class(**{field: product_data[field] for field in fields})
+
+
+# Converters for the numeric fields of typed-in values, other fields stay strings
+_INPUT_CONVERTERS = {"price": int, "quantity_in_stock": int, "warranty_years": int}
+
+
+# Function to build a product from typed-in values (CSV or batch commands)
+def _product_from_values(values, product_id):
+    """Build a product from [Type, Name, Price, Quantity, ...] strings"""
+    values = [value.strip() for value in values]
+    if not values or not values[0]:
+        raise InvalidProductDataError("Missing product type")
+    product_type = values[0].capitalize()
+    product_class = PRODUCT_REGISTRY.get(product_type)
+    if product_class is None:
+        raise InvalidProductDataError(f"Unknown product type: {values[0]}")
+
+    fields = _COMMON_FIELDS[1:] + product_class._extra_fields
+    if len(values) - 1 != len(fields):
+        raise InvalidProductDataError(
+            f"{product_type} needs {len(fields)} values after the type"
         )
-        return True
 
-    except Exception as e:
-        print(f"❌ Error saving inventory: {e}")
-        return False
+    product_data = {"product_id": product_id, "type": product_type}
+    for field, value in zip(fields, values[1:]):
+        product_data[field] = _INPUT_CONVERTERS.get(field, str)(value)
+    return _product_from_dict(product_data)
+
+
+# Function to write products to a file in JSON Lines format
+def _write_product_records(filename, products):
+    """Write one JSON record per line, without building the whole document"""
+    with open(filename, "wb") as file:
+        for product in products:
+            file.write(_dumps(_product_to_dict(product)) + b"\n")
+
+
+# Function to read product records from a file one at a time
+def _read_product_records(filename):
+    """Yield product records from a JSON Lines file, one line at a time.
+    Files saved in the older format (a single JSON array) are still read."""
+    with open(filename, "rb") as file:
+        lines = (line for line in file if line.strip())
+        first_line = next(lines, None)
+        if first_line is None:
+            return
+
+        if first_line.lstrip().startswith(b"["):
+            file.seek(0)
+            if ijson is not None:
+                # parse the array incrementally, one product at a time
+                yield from ijson.items(file, "item", use_float=True)
+            else:
+                yield from _loads(file.read())
+            return
+
+        yield _loads(first_line)
+        for line in lines:
+            yield _loads(line)
+
+
+# Function to check whether an inventory file is an SQLite database
+def _is_sqlite_file(filename):
+    """Tell SQLite inventory files apart from JSON Lines ones by extension"""
+    return filename.lower().endswith(SQLITE_EXTENSIONS)
+
+
+# Function to list the columns of the SQLite products table
+def _product_columns():
+    """Common fields, the type, then every type-specific field; fields that
+    do not apply to a product's type are left NULL"""
+    columns = list(_COMMON_FIELDS) + ["type"]
+    for product_class in PRODUCT_REGISTRY.values():
+        columns += [f for f in product_class._extra_fields if f not in columns]
+    return columns
+
+
+# Function to write products to an SQLite database
+def _write_product_rows(filename, products, deleted_ids=None):
+    """Write products to the products table in a single transaction.
+    By default the whole table is replaced; when deleted_ids is given, only
+    those rows are deleted and the given products are upserted."""
+    columns = _product_columns()
+    upsert = (
+        f"INSERT OR REPLACE INTO products ({', '.join(columns)}) "
+        f"VALUES ({', '.join('?' * len(columns))})"
+    )
+    connection = sqlite3.connect(filename)
+    try:
+        with connection:  # commits on success, rolls back on error
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS products "
+                f"(product_id INTEGER PRIMARY KEY, {', '.join(columns[1:])})"
+            )
+            if deleted_ids is None:
+                connection.execute("DELETE FROM products")
+            else:
+                connection.executemany(
+                    "DELETE FROM products WHERE product_id = ?",
+                    ((product_id,) for product_id in deleted_ids),
+                )
+            connection.executemany(
+                upsert,
+                (
+                    [product_data.get(column) for column in columns]
+                    for product_data in map(_product_to_dict, products)
+                ),
+            )
+    finally:
+        connection.close()
+
+
+# Function to read product records from an SQLite database
+def _read_product_rows(filename):
+    """Yield product records from the products table, one row at a time"""
+    connection = sqlite3.connect(filename)
+    connection.row_factory = sqlite3.Row
+    try:
+        for row in connection.execute("SELECT * FROM products ORDER BY product_id"):
+            yield {key: row[key] for key in row.keys() if row[key] is not None}
+    finally:
+        connection.close()
+
+
+# Function to save the inventory data to a file
+def save_inventory(inventory):
+    """Save the inventory data to the default inventory file"""
+    return inventory.save_to_file(INVENTORY_FILE)
 
 
 # Function to load the inventory data from a file
@@ -106,102 +277,34 @@ def load_inventory():
     """Load the inventory data from a file"""
     if os.path.exists(INVENTORY_FILE):
         try:
-            # Read from file
-            with open(INVENTORY_FILE, "r") as file:
-                products_data = json.load(file)
-
             # Create a new inventory
             inventory = Inventory([])
 
-            # Recreate products
-            for product_data in products_data:
+            # Recreate products while streaming records from the file
+            if _is_sqlite_file(INVENTORY_FILE):
+                records = _read_product_rows(INVENTORY_FILE)
+            else:
+                records = _read_product_records(INVENTORY_FILE)
+            skipped = False
+            for product_data in records:
                 try:
-                    # Check for required fields
-                    required_fields = [
-                        "product_id",
-                        "name",
-                        "price",
-                        "quantity_in_stock",
-                        "type",
-                    ]
-                    for field in required_fields:
-                        if field not in product_data:
-                            raise InvalidProductDataError(
-                                f"Missing required field: {field}"
-                            )
-
-                    product_type = product_data["type"]
-
-                    if product_type == "Electronics":
-                        # Check for Electronics-specific fields
-                        if (
-                            "warranty_years" not in product_data
-                            or "brand" not in product_data
-                        ):
-                            raise InvalidProductDataError(
-                                "Missing Electronics-specific fields"
-                            )
-
-                        product = Electronics(
-                            product_data["product_id"],
-                            product_data["name"],
-                            product_data["price"],
-                            product_data["quantity_in_stock"],
-                            product_data["warranty_years"],
-                            product_data["brand"],
-                        )
-                    elif product_type == "Grocery":
-                        # Check for Grocery-specific fields
-                        if "expiry_date" not in product_data:
-                            raise InvalidProductDataError(
-                                "Missing Grocery-specific fields"
-                            )
-
-                        product = Grocery(
-                            product_data["product_id"],
-                            product_data["name"],
-                            product_data["price"],
-                            product_data["quantity_in_stock"],
-                            product_data["expiry_date"],
-                        )
-                    elif product_type == "Clothing":
-                        # Check for Clothing-specific fields
-                        if "size" not in product_data or "material" not in product_data:
-                            raise InvalidProductDataError(
-                                "Missing Clothing-specific fields"
-                            )
-
-                        product = Clothing(
-                            product_data["product_id"],
-                            product_data["name"],
-                            product_data["price"],
-                            product_data["quantity_in_stock"],
-                            product_data["size"],
-                            product_data["material"],
-                        )
-                    else:
-                        raise InvalidProductDataError(
-                            f"Unknown product type: {product_type}"
-                        )
-
-                    inventory._products.append(product)
-
-                except InvalidProductDataError as e:
+                    inventory.add_product(_product_from_dict(product_data))
+
+                except (InvalidProductDataError, DuplicateProductIDError) as e:
                     print(f"⚠️ Skipping invalid product: {e}")
+                    skipped = True
                     continue
 
-            # Update total_products global variable
-            global total_products
-            if inventory._products:
-                max_id = max(product._product_id for product in inventory._products)
-                total_products = max(total_products, max_id)
+            # the file holds exactly these products unless some were skipped
+            if not skipped:
+                inventory._mark_in_sync(INVENTORY_FILE)
 
             print(
                 f"📚 Inventory loaded from {INVENTORY_FILE} with {len(inventory._products)} products"
             )
             return inventory
 
-        except json.JSONDecodeError:
+        except (json.JSONDecodeError, *_IJSON_ERRORS):
             print(
                 f"❌ Error loading inventory: Invalid JSON format in {INVENTORY_FILE}"
             )
@@ -214,35 +317,68 @@ def load_inventory():
         return Inventory([])
 
 
-# abstract class to manage other classes
-class Product(ABC):
-    """An Abstract class using to manage other classes"""
+# base class to manage other classes
+class Product:
+    """A base class using to manage other classes"""
+
+    # fixed attribute layout, products carry no per-instance __dict__
+    __slots__ = (
+        "_product_id",
+        "_name",
+        "_name_lower",
+        "_price",
+        "_quantity_in_stock",
+        "_type_key",
+    )
+
+    # type name stored in the inventory file; subclasses override it
+    _type_name: ClassVar[str] = "Product"
+
+    # display template, formatted once per __str__ call; subclasses extend it
+    _FMT = (
+        "Name: {self._name}  |  ID: {self._product_id}  |  Price: {self._price}"
+        "  |  Stock: {self._quantity_in_stock}"
+    )
 
     def __init__(self, product_id: int, name: str, price: int, quantity_in_stock: int):
         self._product_id: int = product_id
         self._name: str = name
+        # case-folded name, computed once for case-insensitive searches
+        self._name_lower: str = name.casefold()
         self._price: int = price
         self._quantity_in_stock: int = quantity_in_stock
+        # lowercase class name, used as the key of the inventory's type index
+        self._type_key: str = self._type_name.lower()
 
-    @abstractmethod
     def restock(self, amount):
-        pass
+        self._quantity_in_stock += amount
 
-    @abstractmethod
     def sell(self, quantity):
-        pass
+        if self._quantity_in_stock < quantity:
+            raise InsufficientStockError(self._name, quantity, self._quantity_in_stock)
+        self._quantity_in_stock -= quantity
 
     def get_total_value(self):
         return self._price * self._quantity_in_stock
 
     def __str__(self):
-        return f"Name: {self._name}  |  ID: {self._product_id}  |  Price: {self._price}  |  Stock: {self._quantity_in_stock}"
+        return self._FMT.format(self=self)
 
 
 # child class of Product for electronics items
 class Electronics(Product):
     """Class which inherit Product and will include all the electronics items"""
 
+    __slots__ = ("warranty_years", "brand")
+    _type_name: ClassVar[str] = "Electronics"
+    # constructor fields stored in the inventory file besides the common ones
+    _extra_fields = ("warranty_years", "brand")
+
+    _FMT = (
+        Product._FMT
+        + "  |  warranty: {self.warranty_years} years  |  brand: {self.brand}"
+    )
+
     def __init__(
         self,
         product_id,
@@ -256,26 +392,25 @@ class Electronics(Product):
         self.warranty_years = warranty_years
         self.brand = brand
 
-    def restock(self, amount):
-        self._quantity_in_stock += amount
-
-    def sell(self, quantity):
-        if self._quantity_in_stock >= quantity:
-            self._quantity_in_stock -= quantity
-        else:
-            raise InsufficientStockError(self._name, quantity, self._quantity_in_stock)
 
-    def __str__(self):
-        return (
-            super().__str__()
-            + f"  |  warranty: {self.warranty_years} years  |  brand: {self.brand}"
-        )
+# Function to convert a DD/MM/YYYY string to a date
+# (memoized, since groceries from one batch tend to share an expiry date)
+@functools.lru_cache(maxsize=1024)
+def _parse_ddmmyyyy(date_str):
+    """Convert DD/MM/YYYY string to date object"""
+    return datetime.datetime.strptime(date_str, DATE_FORMAT).date()
 
 
 # child class of Product for grocery items
 class Grocery(Product):
     """Class which inherit Product and will include all the Grocery items"""
 
+    __slots__ = ("expiry_date",)
+    _type_name: ClassVar[str] = "Grocery"
+    _extra_fields = ("expiry_date",)
+
+    _FMT = Product._FMT + "  |  Expriry: {self.expiry_date:" + DATE_FORMAT + "}"
+
     def __init__(
         self,
         product_id,
@@ -285,41 +420,31 @@ class Grocery(Product):
         expiry_date: str,
     ):
         super().__init__(product_id, name, price, quantity_in_stock)
-        self.expiry_date_str = expiry_date
-        self.expiry_date = self._parse_date(expiry_date)
-
-    def _parse_date(self, date_str):
-        """Convert DD/MM/YYYY string to datetime object"""
         try:
-            day, month, year = map(int, date_str.split("/"))
-            return datetime.datetime(year, month, day)
+            self.expiry_date: datetime.date = _parse_ddmmyyyy(expiry_date)
         except ValueError:
-            print(f"⚠️ Invalid date format: {date_str}. Using current date instead.")
-            return datetime.datetime.now()
-
-    def restock(self, amount):
-        self._quantity_in_stock += amount
-
-    def sell(self, quantity):
-        if self._quantity_in_stock >= quantity:
-            self._quantity_in_stock -= quantity
-        else:
-            raise InsufficientStockError(self._name, quantity, self._quantity_in_stock)
+            print(f"⚠️ Invalid date format: {expiry_date}. Using current date instead.")
+            self.expiry_date = datetime.date.today()
 
     def is_expired(self, current_date=None):
         """Check if product is expired compared to given date or today"""
         if current_date is None:
-            current_date = datetime.datetime.now()
+            current_date = datetime.date.today()
+        elif isinstance(current_date, datetime.datetime):
+            current_date = current_date.date()
         return self.expiry_date < current_date
 
-    def __str__(self):
-        return super().__str__() + f"  |  Expriry: {self.expiry_date_str}"
-
 
 # child class of Product for Clothing items
 class Clothing(Product):
     """Class which inherit Product and will include all the Grocery items"""
 
+    __slots__ = ("size", "material")
+    _type_name: ClassVar[str] = "Clothing"
+    _extra_fields = ("size", "material")
+
+    _FMT = Product._FMT + "  |  Size: {self.size}  |  Material: {self.material}"
+
     def __init__(
         self, product_id, name, price, quantity_in_stock, size: str, material: str
     ):
@@ -327,57 +452,149 @@ class Clothing(Product):
         self.size = size
         self.material = material
 
-    def restock(self, amount):
-        self._quantity_in_stock += amount
 
-    def sell(self, quantity):
-        if self._quantity_in_stock >= quantity:
-            self._quantity_in_stock -= quantity
-        else:
-            raise InsufficientStockError(self._name, quantity, self._quantity_in_stock)
+# product classes by the type name stored in the inventory file
+PRODUCT_REGISTRY: dict[str, type[Product]] = {
+    product_class._type_name: product_class
+    for product_class in (Electronics, Grocery, Clothing)
+}
 
-    def __str__(self):
-        return (
-            super().__str__() + f"  |  Size: {self.size}  |  Material: {self.material}"
-        )
+# type-specific fields of the record saved for each product class
+_EXTRA_FIELD_GETTERS = {
+    Electronics: lambda p: {"warranty_years": p.warranty_years, "brand": p.brand},
+    Grocery: lambda p: {"expiry_date": p.expiry_date.strftime(DATE_FORMAT)},
+    Clothing: lambda p: {"size": p.size, "material": p.material},
+}
 
 
 # class inventory to manage collection of products
 class Inventory:
-    def __init__(self, products):
-        self._products = products
+    def __init__(self, products, verbose=True):
+        # when False, success messages of inventory operations are not printed
+        self.verbose = verbose
+        # products are keyed by product_id for constant-time lookups
+        if isinstance(products, dict):
+            products = products.values()
+        self._products: dict[int, Product] = {}
+        # next free product ID, always past the highest ID added so far
+        self._next_id: int = 1
+        # secondary indexes kept in sync by add/remove for fast searches
+        self._by_type: dict[str, dict[int, Product]] = defaultdict(dict)
+        self._name_tokens: dict[str, set[int]] = defaultdict(set)
+        # (expiry_date, product_id) of every grocery; new entries are appended
+        # and the list is only sorted again before an expiry sweep, so the
+        # expired groceries are a prefix found with one binary search
+        self._expiry_index: list[tuple[datetime.date, int]] = []
+        self._expiry_sorted: bool = True
+        # running sum of price * stock, adjusted by every inventory operation
+        # so the total value never needs a pass over all products
+        self._total_value: int = 0
+        # products changed or removed since the inventory was last saved to
+        # (or loaded from) _synced_file, which is a (filename, mtime) pair
+        self._dirty_ids: set[int] = set()
+        self._deleted_ids: set[int] = set()
+        self._synced_file: tuple[str, int] | None = None
+        for product in products:
+            self.add_product(product)
+
+    # remembering that filename now holds exactly the current products
+    def _mark_in_sync(self, filename):
+        self._dirty_ids.clear()
+        self._deleted_ids.clear()
+        self._synced_file = (filename, os.stat(filename).st_mtime_ns)
+
+    # checking that filename was last saved/loaded by this inventory and has
+    # not been modified since (only _dirty_ids / _deleted_ids differ)
+    def _is_synced_with(self, filename):
+        return (
+            self._synced_file is not None
+            and self._synced_file[0] == filename
+            and os.path.exists(filename)
+            and os.stat(filename).st_mtime_ns == self._synced_file[1]
+        )
+
+    # recording a product change for the next save
+    def _mark_dirty(self, product_id):
+        self._dirty_ids.add(product_id)
+        self._deleted_ids.discard(product_id)
+
+    # recording a product removal for the next save
+    def _mark_deleted(self, product_id):
+        self._dirty_ids.discard(product_id)
+        self._deleted_ids.add(product_id)
+
+    # adding a product to the search indexes and the running total
+    def _index_product(self, product):
+        self._total_value += product.get_total_value()
+        self._by_type[product._type_key][product._product_id] = product
+        for token in product._name_lower.split():
+            self._name_tokens[token].add(product._product_id)
+        if isinstance(product, Grocery):
+            entry = (product.expiry_date, product._product_id)
+            if self._expiry_index and entry < self._expiry_index[-1]:
+                self._expiry_sorted = False
+            self._expiry_index.append(entry)
+
+    # dropping a product from the search indexes and the running total
+    # (the expiry sweep drops its expiry index entries itself, in one slice)
+    def _unindex_product(self, product, expiry_index=True):
+        self._total_value -= product.get_total_value()
+        del self._by_type[product._type_key][product._product_id]
+        if not self._by_type[product._type_key]:
+            del self._by_type[product._type_key]
+        for token in product._name_lower.split():
+            self._name_tokens[token].discard(product._product_id)
+            if not self._name_tokens[token]:
+                del self._name_tokens[token]
+        if expiry_index and isinstance(product, Grocery):
+            entry = (product.expiry_date, product._product_id)
+            if self._expiry_sorted:
+                del self._expiry_index[bisect.bisect_left(self._expiry_index, entry)]
+            else:
+                self._expiry_index.remove(entry)
 
     # adding a product
     def add_product(self, product: Product):
-        self._products.append(product)
+        if product._product_id in self._products:
+            raise DuplicateProductIDError(product._product_id)
+        self._products[product._product_id] = product
+        if product._product_id >= self._next_id:
+            self._next_id = product._product_id + 1
+        self._index_product(product)
+        self._mark_dirty(product._product_id)
 
     # removing a product by product_id
     def remove_product(self, product_id):
-        original_length = len(self._products)
-        self._products = [
-            product for product in self._products if product._product_id != product_id
-        ]
+        product = self._products.pop(product_id, None)
+        if product is None:
+            raise ProductNotFoundError(product_id)
 
-        if len(self._products) < original_length:
+        self._unindex_product(product)
+        self._mark_deleted(product_id)
+        if self.verbose:
             print(f"✅ Product with ID {product_id} removed successfully!")
-            return True
-        else:
-            print(f"❌ No product with ID {product_id} found.")
-            return False
+        return True
 
     # searching products by name
     def search_by_name(self, name):
-        matching_products = [
-            product
-            for product in self._products
-            if name.lower() in product._name.lower()
-        ]
+        needle = name.casefold()
+        if needle and needle.split() == [needle]:
+            # a query without whitespace can only match inside a single name
+            # token, so only the (deduplicated) token vocabulary is scanned
+            matching_ids = set()
+            for token, product_ids in self._name_tokens.items():
+                if needle in token:
+                    matching_ids.update(product_ids)
+            matching_products = [self._products[pid] for pid in sorted(matching_ids)]
+        else:
+            matching_products = [
+                product
+                for product in self._products.values()
+                if needle in product._name_lower
+            ]
 
         if matching_products:
-            print(f"\n----- Products matching '{name}' -----")
-            for i, product in enumerate(matching_products, 1):
-                print(f"{i}. {product}")
-            print("-----------------------------\n")
+            self._print_products(f"Products matching '{name}'", matching_products)
             return matching_products
         else:
             print(f"❌ No products found matching '{name}'.")
@@ -385,17 +602,12 @@ class Inventory:
 
     # searching products by type (Electronics, Grocery, Clothing)
     def search_by_type(self, product_type):
-        matching_products = [
-            product
-            for product in self._products
-            if product.__class__.__name__.lower() == product_type.lower()
-        ]
+        matching_products = list(self._by_type.get(product_type.lower(), {}).values())
 
         if matching_products:
-            print(f"\n----- Products of type '{product_type}' -----")
-            for i, product in enumerate(matching_products, 1):
-                print(f"{i}. {product}")
-            print("-----------------------------\n")
+            self._print_products(
+                f"Products of type '{product_type}'", matching_products
+            )
             return matching_products
         else:
             print(f"❌ No products found of type '{product_type}'.")
@@ -407,125 +619,131 @@ class Inventory:
             print("⚠️  Inventory is empty!")
             return
 
-        print("\n----- Current Inventory -----")
-        for i, product in enumerate(self._products, 1):
-            print(f"{i}. {product}")
-        print("-----------------------------\n")
+        self._print_products("Current Inventory", self._products.values())
+
+    # printing a numbered product listing with a single write to stdout
+    def _print_products(self, title, products):
+        lines = [f"{i}. {product}" for i, product in enumerate(products, 1)]
+        sys.stdout.write(
+            f"\n----- {title} -----\n"
+            + "\n".join(lines)
+            + "\n-----------------------------\n\n"
+        )
 
     # selling a product by product_id and quantity
     def sell_product(self, product_id, quantity):
-        for product in self._products:
-            if product._product_id == product_id:
-                try:
-                    product.sell(quantity)
-                    print(f"✅ Sold {quantity} units of '{product._name}'.")
-                    return True
-                except InsufficientStockError as e:
-                    print(f"❌ {e}")
-                    return False
-
-        print(f"❌ No product with ID {product_id} found.")
-        return False
+        product = self._products.get(product_id)
+        if product is None:
+            raise ProductNotFoundError(product_id)
+
+        product.sell(quantity)  # raises InsufficientStockError
+        self._total_value -= product._price * quantity
+        self._mark_dirty(product_id)
+        if self.verbose:
+            print(f"✅ Sold {quantity} units of '{product._name}'.")
+        return True
 
     # restocking a product by product_id and quantity
     def restock_product(self, product_id, quantity):
-        for product in self._products:
-            if product._product_id == product_id:
-                product.restock(quantity)
-                print(
-                    f"✅ Restocked {quantity} units of '{product._name}'. New stock: {product._quantity_in_stock}"
-                )
-                return True
-
-        print(f"❌ No product with ID {product_id} found.")
-        return False
+        product = self._products.get(product_id)
+        if product is None:
+            raise ProductNotFoundError(product_id)
+
+        product.restock(quantity)
+        self._total_value += product._price * quantity
+        self._mark_dirty(product_id)
+        if self.verbose:
+            print(
+                f"✅ Restocked {quantity} units of '{product._name}'. New stock: {product._quantity_in_stock}"
+            )
+        return True
 
     # calculating total inventory value
     def total_inventory_value(self):
-        total_value = sum(product.get_total_value() for product in self._products)
-        print(f"📊 Total Inventory Value: ${total_value}")
-        return total_value
+        print(f"📊 Total Inventory Value: ${self._total_value}")
+        return self._total_value
 
     # removing expired products (for groceries only)
     def remove_expired_products(self, current_date_str):
-        # Parse the current date string to datetime object
+        # Parse the current date string once, up front
         try:
-            day, month, year = map(int, current_date_str.split("/"))
-            current_date = datetime.datetime(year, month, day)
+            current_date = _parse_ddmmyyyy(current_date_str)
         except ValueError:
             print(
                 f"⚠️ Invalid date format: {current_date_str}. Using today's date instead."
             )
-            current_date = datetime.datetime.now()
-
-        expired_products = []
-
-        # Identify expired products
-        for product in self._products:
-            if isinstance(product, Grocery):
-                if product.is_expired(current_date):
-                    expired_products.append(product)
+            current_date = datetime.date.today()
+
+        # Expired groceries are the entries sorting before (current_date,)
+        if not self._expiry_sorted:
+            self._expiry_index.sort()
+            self._expiry_sorted = True
+        expired_count = bisect.bisect_left(self._expiry_index, (current_date,))
+        expired_products = [
+            self._products[product_id]
+            for _, product_id in self._expiry_index[:expired_count]
+        ]
+        del self._expiry_index[:expired_count]
 
         # Remove expired products
         if expired_products:
             for product in expired_products:
-                self._products.remove(product)
-                print(
-                    f"🗑️ Removed expired product: {product._name} (Expiry: {product.expiry_date_str})"
-                )
-
-            print(f"✅ Removed {len(expired_products)} expired products.")
+                del self._products[product._product_id]
+                self._unindex_product(product, expiry_index=False)
+                self._mark_deleted(product._product_id)
+                if self.verbose:
+                    print(
+                        f"🗑️ Removed expired product: {product._name} (Expiry: {product.expiry_date.strftime(DATE_FORMAT)})"
+                    )
+
+            if self.verbose:
+                print(f"✅ Removed {len(expired_products)} expired products.")
             return expired_products
         else:
-            print("✅ No expired products found.")
+            if self.verbose:
+                print("✅ No expired products found.")
             return []
 
     # save inventory to file
     def save_to_file(self, filename):
-        """Save the inventory data to a JSON file"""
+        """Save the inventory data to a JSON Lines file, or to an SQLite
+        database when the file name has one of the SQLITE_EXTENSIONS"""
+        if _is_sqlite_file(filename):
+            write_products = _write_product_rows
+        else:
+            write_products = _write_product_records
+
         try:
-            # Create a list to store serializable product data
-            products_data = []
+            # Skip the write if nothing changed since this file was saved/loaded
+            synced = self._is_synced_with(filename)
+            if synced and not self._dirty_ids and not self._deleted_ids:
+                if self.verbose:
+                    print(f"✅ No changes since {filename} was last saved.")
+                return True
 
             # Check if inventory is empty
             if not self._products:
                 print("⚠️ Inventory is empty! Nothing to save.")
-                # Still save an empty list to the file
-                with open(filename, "w") as file:
-                    json.dump(products_data, file, indent=4)
-                print(f"✅ Empty inventory saved to {filename}")
+                # Still save an empty file
+                write_products(filename, [])
+                self._mark_in_sync(filename)
+                if self.verbose:
+                    print(f"✅ Empty inventory saved to {filename}")
                 return True
 
-            # If we have products, serialize them
-            for product in self._products:
-                # Common product data
-                product_data = {
-                    "product_id": product._product_id,
-                    "name": product._name,
-                    "price": product._price,
-                    "quantity_in_stock": product._quantity_in_stock,
-                    "type": product.__class__.__name__,
-                }
-
-                # Add specific attributes based on product type
-                if isinstance(product, Electronics):
-                    product_data["warranty_years"] = product.warranty_years
-                    product_data["brand"] = product.brand
-                elif isinstance(product, Grocery):
-                    product_data["expiry_date"] = product.expiry_date_str
-                elif isinstance(product, Clothing):
-                    product_data["size"] = product.size
-                    product_data["material"] = product.material
-
-                products_data.append(product_data)
-
-            # Write to file
-            with open(filename, "w") as file:
-                json.dump(products_data, file, indent=4)
+            if synced and write_products is _write_product_rows:
+                # the database only needs the changed and removed rows
+                changed = [self._products[pid] for pid in self._dirty_ids]
+                _write_product_rows(filename, changed, self._deleted_ids)
+            else:
+                # If we have products, write them out one record at a time
+                write_products(filename, self._products.values())
+            self._mark_in_sync(filename)
 
-            print(
-                f"✅ Inventory with {len(products_data)} products saved to {filename} successfully!"
-            )
+            if self.verbose:
+                print(
+                    f"✅ Inventory with {len(self._products)} products saved to {filename} successfully!"
+                )
             return True
 
         except Exception as e:
@@ -533,8 +751,23 @@ class Inventory:
             return False
 
 
-# assigning ids by calculating total products
-total_products = 1
+# main menu shown on every iteration of the menu loop
+_MENU_PROMPT = (
+    "~~~~~~~~~~~~~~~~~~~~~~~~~\n"
+    "1. ➕ Add a Product\n"
+    "2. ❎ Remove a Product\n"
+    "3. 🔍 Search For a Product\n"
+    "4. 📚 Display All Products\n"
+    "5. 💰 Sell a Product\n"
+    "6. 📦 Restock a Product\n"
+    "7. 📊 View Inventory Value\n"
+    "8. 🗑️  Remove Expired Products\n"
+    "9. 💾 Save Inventory\n"
+    "10. 📂 Load Inventory\n"
+    "11. 🚪 Exit\n"
+    "12. 📋 Bulk Add Products (CSV)\n"
+    "~~~~~~~~~~~~~~~~~~~~~~~~~"
+)
 
 
 def run_inventory_system(inventory):
@@ -545,23 +778,9 @@ def run_inventory_system(inventory):
     )
 
     while condition:
-        print(
-            "~~~~~~~~~~~~~~~~~~~~~~~~~\n"
-            "1. ➕ Add a Product\n"
-            "2. ❎ Remove a Product\n"
-            "3. 🔍 Search For a Product\n"
-            "4. 📚 Display All Products\n"
-            "5. 💰 Sell a Product\n"
-            "6. 📦 Restock a Product\n"
-            "7. 📊 View Inventory Value\n"
-            "8. 🗑️  Remove Expired Products\n"
-            "9. 💾 Save Inventory\n"
-            "10. 📂 Load Inventory\n"
-            "11. 🚪 Exit\n"
-            "~~~~~~~~~~~~~~~~~~~~~~~~~"
-        )
+        print(_MENU_PROMPT)
 
-        opt = input("🔢 Enter Your Choice in Numbers (1-11): ")
+        opt = input("🔢 Enter Your Choice in Numbers (1-12): ")
 
         try:
             # ADDING A PRODUCT
@@ -610,11 +829,7 @@ def run_inventory_system(inventory):
             elif opt == "10":
                 loaded_inventory = load_inventory()
                 if loaded_inventory and loaded_inventory._products:
-                    inventory._products = loaded_inventory._products
-                    global total_products
-                    # Update total_products to be at least the highest product ID
-                    for product in inventory._products:
-                        total_products = max(total_products, product._product_id)
+                    inventory = loaded_inventory
                     print(f"✅ Loaded {len(inventory._products)} products.")
             # EXIT
             elif opt == "11":
@@ -623,9 +838,15 @@ def run_inventory_system(inventory):
                     "👋 Goodbye! Thank you for using the Inventory Management System."
                 )
 
+            # BULK ADD PRODUCTS
+            elif opt == "12":
+                bulk_add_menu(inventory)
+
             else:
-                print("⚠️  Please select from numbers given above (1-11)!")
+                print("⚠️  Please select from numbers given above (1-12)!")
 
+        except (InsufficientStockError, ProductNotFoundError) as e:
+            print(f"❌ {e}")
         except ValueError:
             print("❌ Please enter a valid number!")
         except Exception as e:
@@ -648,8 +869,7 @@ def add_product_menu(inventory):
     )
 
     try:
-        global total_products
-        product_id = total_products + 1  # Auto-increment product ID
+        product_id = inventory._next_id  # Auto-increment product ID
         name = input("Enter the product's name: ")
         price = int(input("Enter the Price: "))
         quantity_in_stock = int(input("Enter the quantity available in stock: "))
@@ -684,14 +904,41 @@ def add_product_menu(inventory):
             print("⚠️  Please enter a valid option (1-3)!")
             return
 
-        total_products += 1  # Increment the total products counter
-
     except ValueError:
         print("❌ Please enter valid numeric values for price, quantity, etc.")
     except Exception as e:
         print(f"❌ Something went wrong: {e}")
 
 
+# asking user for several products at once, one comma-separated line each
+def bulk_add_menu(inventory):
+    """Function to handle the bulk add (CSV) menu"""
+    print(
+        "~~~~~~~~~~~~~~~~~~~~~~~~~\n"
+        "Enter one product per line:\n"
+        "Electronics,Name,Price,Quantity,Warranty Years,Brand\n"
+        "Grocery,Name,Price,Quantity,Expiry Date (DD/MM/YYYY)\n"
+        "Clothing,Name,Price,Quantity,Size,Material\n"
+        "Leave the line empty to finish.\n"
+        "~~~~~~~~~~~~~~~~~~~~~~~~~"
+    )
+
+    added = 0
+    while True:
+        line = input("📋 ").strip()
+        if not line:
+            break
+
+        try:
+            product = _product_from_values(line.split(","), inventory._next_id)
+            inventory.add_product(product)
+            added += 1
+        except (InventoryError, ValueError) as e:
+            print(f"❌ Skipping '{line}': {e}")
+
+    print(f"✅ Added {added} products.")
+
+
 # asking user that in which category(by name or by type) they want to search product
 def search_product_menu(inventory):
     """Function to handle the search product menu"""
@@ -714,12 +961,111 @@ def search_product_menu(inventory):
         print("⚠️ Please enter a valid option (1-2)!")
 
 
+# commands accepted in batch mode, mapped to the number of tab-separated
+# arguments they take (None for any number) and a handler that is called
+# with the inventory and those arguments
+_BATCH_COMMANDS = {
+    "ADD": (
+        None,
+        lambda inventory, *values: inventory.add_product(
+            _product_from_values(values, inventory._next_id)
+        ),
+    ),
+    "REMOVE": (
+        1,
+        lambda inventory, product_id: inventory.remove_product(int(product_id)),
+    ),
+    "SELL": (
+        2,
+        lambda inventory, product_id, quantity: inventory.sell_product(
+            int(product_id), int(quantity)
+        ),
+    ),
+    "RESTOCK": (
+        2,
+        lambda inventory, product_id, quantity: inventory.restock_product(
+            int(product_id), int(quantity)
+        ),
+    ),
+    "REMOVE_EXPIRED": (
+        1,
+        lambda inventory, current_date: inventory.remove_expired_products(current_date),
+    ),
+    "SAVE": (0, lambda inventory: save_inventory(inventory)),
+    "LIST": (0, lambda inventory: inventory.list_all_products()),
+    "SEARCH_NAME": (1, lambda inventory, name: inventory.search_by_name(name)),
+    "SEARCH_TYPE": (
+        1,
+        lambda inventory, product_type: inventory.search_by_type(product_type),
+    ),
+    "VALUE": (0, lambda inventory: inventory.total_inventory_value()),
+}
+
+# batch commands whose output is the result, so it stays on stdout
+_BATCH_QUERIES = {"LIST", "SEARCH_NAME", "SEARCH_TYPE", "VALUE"}
+
+
+def run_batch(inventory, commands):
+    """Run newline-separated commands (tab-separated arguments) without the menu.
+    Status messages go to stderr so that stdout only carries query results."""
+    for line_number, line in enumerate(commands.splitlines(), 1):
+        if not line.strip():
+            continue
+
+        command, *args = line.split("\t")
+        command = command.strip().upper()
+        if command not in _BATCH_COMMANDS:
+            print(
+                f"❌ Line {line_number}: Unknown command '{command}'", file=sys.stderr
+            )
+            continue
+
+        arity, handler = _BATCH_COMMANDS[command]
+        if arity is not None and len(args) != arity:
+            print(
+                f"❌ Line {line_number}: {command} takes {arity} argument(s), "
+                f"got {len(args)}",
+                file=sys.stderr,
+            )
+            continue
+
+        output = sys.stdout if command in _BATCH_QUERIES else sys.stderr
+        try:
+            with contextlib.redirect_stdout(output):
+                handler(inventory, *args)
+        except (InventoryError, ValueError) as e:
+            print(f"❌ Line {line_number}: {e}", file=sys.stderr)
+
+
 # Main code execution
 if __name__ == "__main__":  # ensure that the script is being run directly not imported
-    # Initialize inventory with sample products
-    inventory = (
-        load_inventory()
-    )  # trying to load inventory or starting with an empty one
+    parser = argparse.ArgumentParser(
+        description="Advance OOP Inventory Management System"
+    )
+    parser.add_argument(
+        "--file",
+        default=INVENTORY_FILE,
+        help="inventory file to load and save (.db/.sqlite/.sqlite3 use SQLite)",
+    )
+    parser.add_argument(
+        "--batch",
+        action="store_true",
+        help="read commands from stdin instead of showing the interactive menu",
+    )
+    args = parser.parse_args()
+    INVENTORY_FILE = args.file
+
+    if args.batch:
+        # status messages go to stderr in batch mode
+        with contextlib.redirect_stdout(sys.stderr):
+            inventory = load_inventory()
+        inventory.verbose = False  # only query results and errors are reported
+        run_batch(inventory, sys.stdin.read())
+    else:
+        # Initialize inventory with sample products
+        inventory = (
+            load_inventory()
+        )  # trying to load inventory or starting with an empty one
 
-    # Run the inventory management system
-    run_inventory_system(inventory)
+        # Run the inventory management system
+        run_inventory_system(inventory)